@@ -51,7 +51,7 @@ class ConfigEntry(object):
                  is_default=False,
                  is_sensitive=False,
                  is_synonym=False,
-                 synonyms=[]):
+                 synonyms=None):
         """
         This class is typically not user instantiated.
         """
@@ -74,7 +74,7 @@ class ConfigEntry(object):
         case .value is None."""
         self.is_synonym = bool(is_synonym)
         """Indicates whether the configuration property is a synonym for the parent configuration entry."""
-        self.synonyms = synonyms
+        self.synonyms = synonyms if synonyms is not None else []
         """A list of synonyms (ConfigEntry) and alternate sources for this configuration property."""
 
     def __repr__(self):
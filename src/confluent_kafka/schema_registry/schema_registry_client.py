@@ -678,12 +678,12 @@ class Schema(object):
     """
     __slots__ = ['schema_str', 'references', 'schema_type', '_hash']
 
-    def __init__(self, schema_str, schema_type, references=[]):
+    def __init__(self, schema_str, schema_type, references=None):
         super(Schema, self).__init__()
 
         self.schema_str = schema_str
         self.schema_type = schema_type
-        self.references = references
+        self.references = references if references is not None else []
         self._hash = hash(schema_str)
 
     def __eq__(self, other):
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limit
+#
+
+from confluent_kafka.admin import AdminClient
+
+
+def test_create_topics(kafka_cluster):
+    """
+    Tests that create_topics creates one uniquely named topic per prefix.
+    """
+    assert kafka_cluster.create_topics([]) == []
+
+    topics = kafka_cluster.create_topics(["test_create_topics_a",
+                                          "test_create_topics_b"])
+    assert len(topics) == 2
+    assert topics[0].startswith("test_create_topics_a-")
+    assert topics[1].startswith("test_create_topics_b-")
+
+    admin = AdminClient(kafka_cluster.client_conf())
+    metadata = admin.list_topics(timeout=10)
+    for topic in topics:
+        assert topic in metadata.topics
+        assert len(metadata.topics[topic].partitions) == 1
@@ -16,7 +16,10 @@
 # limitations under the License.
 #
 
-from uuid import uuid1
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from uuid import uuid4
 
 from trivup.clusters.KafkaCluster import KafkaCluster
 
@@ -25,12 +28,43 @@ from confluent_kafka import Consumer, Producer, DeserializingConsumer, \
 from confluent_kafka.admin import AdminClient, NewTopic
 from confluent_kafka.schema_registry.schema_registry_client import SchemaRegistryClient
 
+log = logging.getLogger(__name__)
+
+# Python 2 considers bytes an instance of str
+try:
+    text_type = unicode  # noqa
+except NameError:
+    text_type = str
+
+_DEFAULT_SEED_VALUES = tuple('test-data{}'.format(i).encode('ascii') for i in range(0, 100))
+
+
+def _encode_text(source):
+    """
+    Returns source with any text items UTF-8 encoded, or source itself if it
+    holds no text, so produce() does not encode them on every call.
+    """
+    if not any(isinstance(item, text_type) for item in source):
+        return source
+
+    return [item.encode('utf-8') if isinstance(item, text_type) else item for item in source]
+
 
 class KafkaClusterFixture(object):
-    __slots__ = ['_cluster', '_admin', '_producer']
+    __slots__ = ['_cluster', '_admin', '_producer', '_consumer_cache', '_executor']
+
+    # Shared by every default create_topics() call; treat as read-only.
+    _DEFAULT_TOPIC_CONF = {'num_partitions': 1,
+                           'replication_factor': 1}
 
     def __init__(self, conf):
-        raise NotImplementedError("KafkaCluster should never be instantiated directly")
+        if type(self) is KafkaClusterFixture:
+            raise NotImplementedError("KafkaCluster should never be instantiated directly")
+
+        self._admin = None
+        self._producer = None
+        self._consumer_cache = {}
+        self._executor = None
 
     def schema_registry(self, conf=None):
         raise NotImplementedError("schema_registry has not been implemented")
@@ -40,11 +74,11 @@ class KafkaClusterFixture(object):
 
     @classmethod
     def _topic_conf(cls, conf=None):
-        topic_conf = {'num_partitions': 1,
-                      'replication_factor': 1}
+        if conf is None:
+            return cls._DEFAULT_TOPIC_CONF
 
-        if conf is not None:
-            topic_conf.update(conf)
+        topic_conf = cls._DEFAULT_TOPIC_CONF.copy()
+        topic_conf.update(conf)
 
         return topic_conf
 
@@ -98,7 +132,7 @@ class KafkaClusterFixture(object):
 
         """
         consumer_conf = self.client_conf({
-            'group.id': str(uuid1()),
+            'group.id': uuid4().hex,
             'auto.offset.reset': 'earliest'
         })
 
@@ -107,7 +141,8 @@ class KafkaClusterFixture(object):
 
         return Consumer(consumer_conf)
 
-    def consumer(self, conf=None, key_deserializer=None, value_deserializer=None):
+    def consumer(self, conf=None, key_deserializer=None, value_deserializer=None,
+                 shared=False):
         """
         Returns a consumer bound to this cluster.
 
@@ -120,12 +155,35 @@ class KafkaClusterFixture(object):
             value_deserializer (Deserializer): deserializer to apply to
                 message value
 
+            shared (bool): If True, return the consumer previously created
+                with the same arguments, with its subscription and assignment
+                cleared, instead of a new instance. conf values must be
+                hashable. A shared consumer keeps its group.id, so it is
+                created with enable.auto.commit=False to prevent committed
+                offsets from carrying over between uses; offsets committed
+                explicitly with commit() still do. Shared consumers are closed
+                by close_all() and must not be closed by the caller.
+
         Returns:
-            Consumer: A new DeserializingConsumer instance
+            Consumer: A DeserializingConsumer instance
 
         """
+        if shared:
+            cache_key = (frozenset(conf.items()) if conf else frozenset(),
+                         key_deserializer, value_deserializer)
+            consumer = self._consumer_cache.get(cache_key)
+            if consumer is None:
+                consumer_conf = dict(conf) if conf else {}
+                consumer_conf['enable.auto.commit'] = False
+                consumer = self.consumer(consumer_conf, key_deserializer, value_deserializer)
+                self._consumer_cache[cache_key] = consumer
+            else:
+                consumer.unsubscribe()
+                consumer.unassign()
+            return consumer
+
         consumer_conf = self.client_conf({
-            'group.id': str(uuid1()),
+            'group.id': uuid4().hex,
             'auto.offset.reset': 'earliest'
         })
 
@@ -140,6 +198,19 @@ class KafkaClusterFixture(object):
 
         return DeserializingConsumer(consumer_conf)
 
+    def close_all(self):
+        """
+        Closes all shared consumers handed out by consumer() and waits for
+        any outstanding seed_topic_async() calls.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        for consumer in self._consumer_cache.values():
+            consumer.close()
+        self._consumer_cache.clear()
+
     def create_topic(self, prefix, conf=None):
         """
         Creates a new topic with this cluster.
@@ -149,15 +220,32 @@ class KafkaClusterFixture(object):
         :returns: The topic's name
         :rtype: str
         """
+        return self.create_topics([prefix], conf)[0]
+
+    def create_topics(self, prefixes, conf=None):
+        """
+        Creates a new topic for each prefix with a single admin request.
+
+        :param list(str) prefixes: topic names
+        :param dict conf: additions/overrides to topic configuration,
+            applied to every topic.
+        :returns: The topics' names, in the same order as prefixes
+        :rtype: list(str)
+        """
+        if not prefixes:
+            return []
+
         if self._admin is None:
             self._admin = AdminClient(self.client_conf())
 
-        name = prefix + "-" + str(uuid1())
-        future_topic = self._admin.create_topics([NewTopic(name,
-                                                           **self._topic_conf(conf))])
+        topic_conf = self._topic_conf(conf)
+        names = [prefix + "-" + uuid4().hex for prefix in prefixes]
+        future_topics = self._admin.create_topics([NewTopic(name, **topic_conf)
+                                                   for name in names])
 
-        future_topic.get(name).result()
-        return name
+        for name in names:
+            future_topics.get(name).result()
+        return names
 
     def seed_topic(self, topic, value_source=None, key_source=None, header_source=None):
         """
@@ -166,25 +254,76 @@ class KafkaClusterFixture(object):
         If there are fewer keys or headers than values the index will be wrapped and reused with
         each subsequent produce request.
 
+        The seed producer is configured with acks=1 and only waits for the partition
+        leader to acknowledge writes; do not use seed_topic for tests that verify
+        durability.
+
         :param str topic: topic to produce test data to.
         :param list value_source: list or other iterable containing message key data to be produced.
         :param list key_source: list or other iterable containing message value data to be produced.
         :param list(dict) header_source: headers to attach to test data.
         """
+        self.seed_topics([(topic, value_source, key_source, header_source)])
 
-        if self._producer is None:
-            self._producer = self.producer(self.client_conf({'linger.ms': 500}))
+    def seed_topics(self, items):
+        """
+        Populates several topics with data, flushing the producer only once.
+
+        All topics are seeded through the same producer, allowing librdkafka to
+        combine messages for different topics into the same produce requests.
+
+        :param list(tuple) items: (topic, value_source, key_source, header_source)
+            tuples, with the same meaning and defaults as the seed_topic arguments.
+        """
+        producer = self._seed_producer()
+
+        for topic, value_source, key_source, header_source in items:
+            if value_source is None:
+                value_source = _DEFAULT_SEED_VALUES
+            else:
+                value_source = _encode_text(value_source)
+
+            if key_source is None:
+                key_source = [None]
+            else:
+                key_source = _encode_text(key_source)
+
+            KafkaClusterFixture._produce(producer, topic, value_source, key_source, header_source,
+                                         flush=False)
+
+        producer.flush()
+
+    def seed_topic_async(self, topic, value_source=None, key_source=None, header_source=None):
+        """
+        Populates a topic with data on a background thread.
+
+        Accepts the same arguments as seed_topic, allowing several topics to be
+        seeded concurrently with other test setup.
+
+        :returns: future which completes once the topic has been seeded
+        :rtype: concurrent.futures.Future
+        """
+        # Create the shared producer here so worker threads never race to do so
+        self._seed_producer()
 
-        if value_source is None:
-            value_source = ['test-data{}'.format(i) for i in range(0, 100)]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4)
 
-        if key_source is None:
-            key_source = [None]
+        return self._executor.submit(self.seed_topic, topic, value_source, key_source, header_source)
 
-        KafkaClusterFixture._produce(self._producer, topic, value_source, key_source, header_source)
+    def _seed_producer(self):
+        """
+        Returns the producer used to seed topics, creating it on first use.
+        """
+        if self._producer is None:
+            self._producer = self.cimpl_producer({'linger.ms': 100,
+                                                  'compression.type': 'lz4',
+                                                  'acks': 1})
+
+        return self._producer
 
     @staticmethod
-    def _produce(producer, topic, value_source, key_source, header_source=None):
+    def _produce(producer, topic, value_source, key_source, header_source=None, flush=True):
         """
         Produces a message for each value in value source to a topic.
 
@@ -192,39 +331,42 @@ class KafkaClusterFixture(object):
         are specified they will be applied in round robbin order. In the event there
         are less keys or headers than values the index will be wrapped.
 
-        :param producer: producer instance to use
+        :param producer: cimpl Producer instance to use
         :param topic:  topic to produce to
         :param value_source: collection of message values
         :param key_source: optional keys to accompany values_source items
         :param header_source: optional headers to accompany value_source items
+        :param flush: wait for all outstanding messages to be delivered before returning
         :return:
         """
         num_messages = len(value_source)
-        num_keys = len(key_source)
-        num_headers = len(header_source) if header_source else 0
-
-        print('# producing {} messages to topic {}'.format(num_messages, topic))
-        for i in range(0, num_messages):
+        produce = producer.produce
+        poll = producer.poll
+
+        records = zip(value_source,
+                      cycle(key_source) if key_source else cycle([None]),
+                      cycle(header_source) if header_source else cycle([None]))
+        for i, (value, key, headers) in enumerate(records):
+            # Back off before the local queue fills (queue.buffering.max.messages
+            # defaults to 100000) rather than waiting for produce() to raise.
+            while len(producer) >= 90000:
+                poll(0.05)
             while True:
                 try:
-                    if header_source is not None:
-                        producer.produce(topic,
-                                         value=value_source[i],
-                                         key=key_source[i % num_keys],
-                                         headers=header_source[i % (num_headers + 1)])
-                    else:
-                        producer.produce(topic,
-                                         value=value_source[i],
-                                         key=key_source[i % num_keys])
+                    # topic, value, key, partition, callback, on_delivery, timestamp, headers
+                    produce(topic, value, key, -1, None, None, 0, headers)
                     break
                 except BufferError:
-                    producer.poll(0.1)
-                continue
-            producer.poll(0.0)
+                    # queue.buffering.max.kbytes may still be exceeded first
+                    poll(0.1)
+            # Serve delivery reports every 256 messages, flush() drains the rest
+            if not i & 0xFF:
+                poll(0.0)
 
-        producer.flush()
+        if flush:
+            producer.flush()
 
-        print('# finished producing {} messages to topic {}'.format(num_messages, topic))
+        log.debug('finished producing %d messages to topic %s', num_messages, topic)
 
 
 class TrivupFixture(KafkaClusterFixture):
@@ -235,15 +377,17 @@ class TrivupFixture(KafkaClusterFixture):
 
     """
 
+    __slots__ = ['_base_client_conf']
+
     default_options = {
         'broker_cnt': 1,
     }
 
     def __init__(self, conf):
+        super(TrivupFixture, self).__init__(conf)
         self._cluster = KafkaCluster(**conf)
-        self._admin = None
-        self._producer = None
         self._cluster.wait_operational()
+        self._base_client_conf = self._cluster.client_conf()
 
     def schema_registry(self, conf=None):
         if not hasattr(self._cluster, 'sr'):
@@ -261,7 +405,7 @@ class TrivupFixture(KafkaClusterFixture):
         :param dict conf: default client configuration overrides
         :returns: client configuration
         """
-        client_conf = self._cluster.client_conf()
+        client_conf = self._base_client_conf.copy()
 
         if conf is not None:
             client_conf.update(conf)
@@ -269,7 +413,10 @@ class TrivupFixture(KafkaClusterFixture):
         return client_conf
 
     def stop(self):
-        self._cluster.stop(cleanup=True)
+        try:
+            self.close_all()
+        finally:
+            self._cluster.stop(cleanup=True)
 
 
 class ByoFixture(KafkaClusterFixture):
@@ -278,12 +425,13 @@ class ByoFixture(KafkaClusterFixture):
     by bootstrap.servers, and optionally schema.registry.url, in the conf dict.
     """
 
+    __slots__ = ['_conf', '_sr_url']
+
     def __init__(self, conf):
         if conf.get("bootstrap.servers", "") == "":
             raise ValueError("'bootstrap.servers' must be set in the "
                              "conf dict")
-        self._admin = None
-        self._producer = None
+        super(ByoFixture, self).__init__(conf)
         self._conf = conf.copy()
         self._sr_url = self._conf.pop("schema.registry.url", None)
 
@@ -303,4 +451,4 @@ class ByoFixture(KafkaClusterFixture):
         return client_conf
 
     def stop(self):
-        pass
+        self.close_all()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limit
+#
+
+import pytest
+from confluent_kafka import TopicPartition, OFFSET_BEGINNING
+from confluent_kafka.serialization import StringDeserializer
+
+
+def poll_values(consumer, num_messages):
+    """
+    Polls consumer until num_messages values have been received.
+    """
+    values = []
+    while len(values) < num_messages:
+        msg = consumer.poll(10)
+        assert msg is not None
+        values.append(msg.value())
+    return values
+
+
+def test_shared_consumer(kafka_cluster):
+    """
+    Tests that consumer(shared=True) hands back the same consumer with its
+    assignment reset, and that close_all() closes it.
+    """
+    topic = kafka_cluster.create_topic("test_shared_consumer")
+    consumer_conf = {'session.timeout.ms': 6000}
+    value_deserializer = StringDeserializer()
+
+    consumer = kafka_cluster.consumer(consumer_conf,
+                                      value_deserializer=value_deserializer,
+                                      shared=True)
+    consumer.assign([TopicPartition(topic, 0, OFFSET_BEGINNING)])
+    assert consumer.assignment() == [TopicPartition(topic, 0)]
+
+    shared = kafka_cluster.consumer(consumer_conf,
+                                    value_deserializer=value_deserializer,
+                                    shared=True)
+    assert shared is consumer
+    assert shared.assignment() == []
+
+    unshared = kafka_cluster.consumer(consumer_conf,
+                                      value_deserializer=value_deserializer)
+    assert unshared is not consumer
+    unshared.close()
+
+    kafka_cluster.close_all()
+
+    with pytest.raises(RuntimeError, match="Consumer closed"):
+        consumer.assignment()
+
+    assert kafka_cluster.consumer(consumer_conf,
+                                  value_deserializer=value_deserializer,
+                                  shared=True) is not consumer
+    kafka_cluster.close_all()
+
+
+def test_shared_consumer_subscribe(kafka_cluster):
+    """
+    Tests that a shared consumer re-subscribing to a topic starts over from
+    auto.offset.reset, just like a new consumer would.
+    """
+    topic = kafka_cluster.create_topic("test_shared_consumer_subscribe")
+    kafka_cluster.seed_topic(topic, value_source=[b'a', b'b'])
+
+    consumer = kafka_cluster.consumer(shared=True)
+    consumer.subscribe([topic])
+    assert poll_values(consumer, 2) == [b'a', b'b']
+
+    shared = kafka_cluster.consumer(shared=True)
+    assert shared is consumer
+    shared.subscribe([topic])
+    assert poll_values(shared, 2) == [b'a', b'b']
+
+    kafka_cluster.close_all()
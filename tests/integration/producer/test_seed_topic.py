@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limit
+#
+
+from concurrent.futures import wait
+
+from confluent_kafka import TopicPartition, OFFSET_BEGINNING
+
+
+def read_values(kafka_cluster, topic, num_messages):
+    """
+    Reads num_messages values from the start of a topic's first partition.
+    """
+    consumer = kafka_cluster.consumer()
+    consumer.assign([TopicPartition(topic, 0, OFFSET_BEGINNING)])
+
+    values = []
+    for _ in range(num_messages):
+        msg = consumer.poll(10)
+        assert msg is not None
+        values.append(msg.value())
+
+    consumer.close()
+    return values
+
+
+def test_seed_topic_wraps_keys_and_headers(kafka_cluster):
+    """
+    Tests that seed_topic reuses keys and headers in round robin order
+    when there are fewer of them than values.
+    """
+    topic = kafka_cluster.create_topic("test_seed_topic")
+
+    values = [b'v0', b'v1', b'v2', b'v3', b'v4', b'v5', b'v6']
+    keys = [b'k0', b'k1']
+    headers = [[('h', b'0')], [('h', b'1')], [('h', b'2')]]
+
+    kafka_cluster.seed_topic(topic, value_source=values, key_source=keys,
+                             header_source=headers)
+
+    consumer = kafka_cluster.consumer()
+    consumer.assign([TopicPartition(topic, 0, OFFSET_BEGINNING)])
+
+    for i, value in enumerate(values):
+        msg = consumer.poll(10)
+        assert msg is not None
+        assert msg.value() == value
+        assert msg.key() == keys[i % len(keys)]
+        assert msg.headers() == headers[i % len(headers)]
+
+    consumer.close()
+
+
+def test_seed_topic_async(kafka_cluster):
+    """
+    Tests that topics seeded concurrently by seed_topic_async each receive
+    all of their own messages.
+    """
+    topic1 = kafka_cluster.create_topic("test_seed_topic_async")
+    topic2 = kafka_cluster.create_topic("test_seed_topic_async")
+
+    values1 = [b'a' + str(i).encode('ascii') for i in range(1000)]
+    values2 = [b'b' + str(i).encode('ascii') for i in range(1000)]
+
+    futures = [kafka_cluster.seed_topic_async(topic1, value_source=values1),
+               kafka_cluster.seed_topic_async(topic2, value_source=values2)]
+    done, not_done = wait(futures, timeout=60)
+    assert not not_done
+    for future in done:
+        future.result()
+
+    assert read_values(kafka_cluster, topic1, len(values1)) == values1
+    assert read_values(kafka_cluster, topic2, len(values2)) == values2
+
+
+def test_seed_topics(kafka_cluster):
+    """
+    Tests that seed_topics seeds every item, applying the seed_topic
+    defaults to any source left as None.
+    """
+    topic1, topic2 = kafka_cluster.create_topics(["test_seed_topics",
+                                                  "test_seed_topics"])
+
+    values = [b'x', b'y', b'z']
+    kafka_cluster.seed_topics([(topic1, values, [b'k'], None),
+                               (topic2, None, None, None)])
+
+    assert read_values(kafka_cluster, topic1, len(values)) == values
+
+    default_values = read_values(kafka_cluster, topic2, 100)
+    assert default_values == ['test-data{}'.format(i).encode('ascii') for i in range(0, 100)]
@@ -418,3 +418,10 @@ def test_test_compatibility_with_error(
         sr.test_compatibility(subject_name, schema, version)
     assert e.value.http_status_code == status_code
     assert e.value.error_code == error_code
+
+
+def test_schema_references_default_not_shared():
+    schema = Schema('"string"', schema_type='AVRO')
+    schema.references.append('reference')
+
+    assert Schema('"string"', schema_type='AVRO').references == []